@@ -3,19 +3,25 @@ Enhanced Three-Body Simulation - Professional Grade Visualization
 High-performance real-time physics with stunning visual effects
 """
 
+import os
 import pygame
 import pygame.gfxdraw
 import sys
+import bisect
 import math
 import time
+from collections import deque
 import numpy as np
 from typing import List, Tuple, Optional
 from three_body_sim import (
     AdvancedThreeBodySimulation, PhysicsSettings, Body,
-    create_enhanced_figure_eight, create_enhanced_solar_system, 
+    create_enhanced_figure_eight, create_enhanced_solar_system,
     create_binary_capture
 )
 
+# Let SDL batch consecutive same-texture draws into single GPU commands
+os.environ.setdefault("SDL_RENDER_BATCHING", "1")
+
 # Initialize Pygame with optimizations
 pygame.init()
 pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
@@ -39,11 +45,13 @@ class AdvancedRenderer:
         # Display setup with hardware acceleration
         pygame.display.set_caption("Advanced Three-Body Simulation - Enhanced Edition")
         
-        # Try hardware acceleration
+        # Try hardware acceleration. SCALED routes the final present through
+        # an SDL_Renderer (GPU path); the legacy HWSURFACE flag is ignored by
+        # SDL2-backed pygame.
         try:
             self.screen = pygame.display.set_mode(
-                (SCREEN_WIDTH, SCREEN_HEIGHT), 
-                pygame.HWSURFACE | pygame.DOUBLEBUF
+                (SCREEN_WIDTH, SCREEN_HEIGHT),
+                pygame.SCALED | pygame.DOUBLEBUF, vsync=0
             )
         except:
             self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -55,11 +63,37 @@ class AdvancedRenderer:
         self.font = pygame.font.Font(None, 24)
         self.small_font = pygame.font.Font(None, 18)
         self.tiny_font = pygame.font.Font(None, 14)
+
+        # Pre-rendered UI text (control help never changes)
+        self._controls_title = self.small_font.render("Controls:", True, YELLOW)
+        self._help_surfaces = [
+            self.tiny_font.render(line, True, WHITE) for line in [
+                "SPACE - Pause/Resume", "R - Reset", "T - Toggle trails",
+                "I - Toggle info", "G - Toggle grid", "P - Toggle particles",
+                "F - Toggle force vectors", "V - Toggle velocity vectors",
+                "C - Toggle center of mass", "D - Toggle debug mode",
+                "1,2,3 - Switch scenarios", "+/- - Speed control",
+                "Mouse wheel - Zoom", "Drag - Pan camera",
+                "F1-F3 - Follow body", "F4 - Free camera"
+            ]
+        ]
+        self._fps_surface = None
+        self._fps_value = None
+
+        # Persistent UI panel surfaces (background + border painted once)
+        self._main_panel_surf = self._make_panel_surface(350, 280, WHITE)
+        self._perf_panel_surf = self._make_panel_surface(240, 150, GREEN)
+        # Energy panel border color depends on drift, so cache per color
+        self._energy_panel_surfs = {}
         
         # Simulation management
         self.current_sim = create_enhanced_figure_eight()
         self.simulation_speed = 2.0
         self.target_fps = 120  # Higher target FPS
+
+        # Fixed-timestep accumulator decoupling physics from render rate
+        self._physics_accumulator = 0.0
+        self._max_steps_per_frame = 1000  # Cap to avoid a death spiral
         
         # Enhanced visual settings
         self.show_trails = True
@@ -86,15 +120,22 @@ class AdvancedRenderer:
         self.last_mouse_pos = (0, 0)
         self.keys_pressed = set()
         
-        # Performance monitoring
-        self.frame_times = []
-        self.physics_times = []
-        self.render_times = []
+        # Performance monitoring (physics/render timing only runs in
+        # debug mode; deques make the rolling windows O(1) to maintain)
+        self.frame_times = deque(maxlen=60)
+        self.physics_times = deque(maxlen=60)
+        self.render_times = deque(maxlen=60)
         self.current_fps = 60.0
         
+        self._rng = np.random.default_rng()
+
         # Visual effects
         self.background_stars = self.generate_background_stars()
         self.particle_systems = []
+
+        # Cached background (rebuilt only when the camera moves)
+        self._bg_cache = None
+        self._bg_cache_key = None
         
         # Scenarios
         self.scenarios = {
@@ -115,16 +156,27 @@ class AdvancedRenderer:
         # Create pre-computed glow surfaces for performance
         self.glow_surfaces = {}
         self.create_glow_surfaces()
+        self._glow_radii = sorted(self.glow_surfaces)
+        self.tinted_glow_cache = {}
+        self.particle_cache = {}
+
+        # Persistent surface for alpha-blended trails (cleared each frame)
+        self.trail_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
     
+    def _make_panel_surface(self, width: int, height: int,
+                            border_color: Tuple[int, int, int]) -> pygame.Surface:
+        """Build a semi-transparent UI panel with a border"""
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(surface, UI_BACKGROUND, surface.get_rect())
+        pygame.draw.rect(surface, border_color, surface.get_rect(), 2)
+        return surface
+
     def generate_background_stars(self) -> List[Tuple[int, int, int]]:
         """Generate background star field"""
-        stars = []
-        for _ in range(200):
-            x = np.random.randint(0, SCREEN_WIDTH)
-            y = np.random.randint(0, SCREEN_HEIGHT)
-            brightness = np.random.randint(50, 200)
-            stars.append((x, y, brightness))
-        return stars
+        xs = self._rng.integers(0, SCREEN_WIDTH, 200)
+        ys = self._rng.integers(0, SCREEN_HEIGHT, 200)
+        brightness = self._rng.integers(50, 200, 200)
+        return list(zip(xs.tolist(), ys.tolist(), brightness.tolist()))
     
     def create_glow_surfaces(self):
         """Pre-compute glow effects for better performance"""
@@ -140,12 +192,30 @@ class AdvancedRenderer:
             
             self.glow_surfaces[radius] = surface
     
+    def _nearest_glow_radius(self, radius: int) -> int:
+        """Snap a requested radius to the closest pre-computed glow radius"""
+        radii = self._glow_radii
+        i = bisect.bisect_left(radii, radius)
+        if i == 0:
+            return radii[0]
+        if i == len(radii):
+            return radii[-1]
+        before, after = radii[i - 1], radii[i]
+        return before if radius - before <= after - radius else after
+
     def world_to_screen(self, x: float, y: float) -> Tuple[int, int]:
         """Convert world coordinates to screen coordinates"""
         screen_x = int(self.center_x + x * self.zoom)
         screen_y = int(self.center_y - y * self.zoom)
         return screen_x, screen_y
     
+    def world_to_screen_array(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert an (N, 2) array of world coordinates to screen coordinates"""
+        pts = np.asarray(points, dtype=np.float64)
+        screen_x = (self.center_x + pts[:, 0] * self.zoom).astype(np.int32)
+        screen_y = (self.center_y - pts[:, 1] * self.zoom).astype(np.int32)
+        return screen_x, screen_y
+
     def screen_to_world(self, screen_x: int, screen_y: int) -> Tuple[float, float]:
         """Convert screen coordinates to world coordinates"""
         world_x = (screen_x - self.center_x) / self.zoom
@@ -167,178 +237,265 @@ class AdvancedRenderer:
         self.zoom = self.zoom * 0.9 + self.target_zoom * 0.1
     
     def draw_background(self):
-        """Draw animated background with stars"""
-        self.screen.fill(BACKGROUND_COLOR)
-        
-        # Draw moving stars
-        if self.show_grid:
-            for star_x, star_y, brightness in self.background_stars:
-                # Make stars twinkle
-                twinkle = math.sin(time.time() * 3 + star_x * 0.01) * 0.3 + 0.7
-                color = (int(brightness * twinkle),) * 3
-                pygame.draw.circle(self.screen, color, (star_x, star_y), 1)
-        
-        # Draw coordinate grid
-        if self.show_grid:
-            grid_spacing = max(20, int(50 * self.zoom / 60))
-            for i in range(-10, 11):
-                x_world = i * (1.0 / (self.zoom / 60))
-                y_world = i * (1.0 / (self.zoom / 60))
-                
-                x_screen, _ = self.world_to_screen(x_world, 0)
-                _, y_screen = self.world_to_screen(0, y_world)
-                
-                if 0 <= x_screen <= SCREEN_WIDTH:
-                    pygame.draw.line(self.screen, (30, 30, 50), 
-                                   (x_screen, 0), (x_screen, SCREEN_HEIGHT), 1)
-                if 0 <= y_screen <= SCREEN_HEIGHT:
-                    pygame.draw.line(self.screen, (30, 30, 50), 
-                                   (0, y_screen), (SCREEN_WIDTH, y_screen), 1)
+        """Draw background with stars, cached until the camera moves"""
+        key = (round(self.zoom, 1), round(self.center_x), round(self.center_y),
+               self.show_grid)
+
+        if key != self._bg_cache_key:
+            cache = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            cache.fill(BACKGROUND_COLOR)
+
+            # Draw stars
+            if self.show_grid:
+                for star_x, star_y, brightness in self.background_stars:
+                    pygame.draw.circle(cache, (brightness,) * 3, (star_x, star_y), 1)
+
+            # Draw coordinate grid
+            if self.show_grid:
+                for i in range(-10, 11):
+                    x_world = i * (1.0 / (self.zoom / 60))
+                    y_world = i * (1.0 / (self.zoom / 60))
+
+                    x_screen, _ = self.world_to_screen(x_world, 0)
+                    _, y_screen = self.world_to_screen(0, y_world)
+
+                    if 0 <= x_screen <= SCREEN_WIDTH:
+                        pygame.draw.line(cache, (30, 30, 50),
+                                       (x_screen, 0), (x_screen, SCREEN_HEIGHT), 1)
+                    if 0 <= y_screen <= SCREEN_HEIGHT:
+                        pygame.draw.line(cache, (30, 30, 50),
+                                       (0, y_screen), (SCREEN_WIDTH, y_screen), 1)
+
+            self._bg_cache = cache
+            self._bg_cache_key = key
+
+        self.screen.blit(self._bg_cache, (0, 0))
     
-    def draw_enhanced_body(self, body: Body):
-        """Draw body with advanced visual effects"""
-        screen_x, screen_y = self.world_to_screen(body.x, body.y)
-        
-        # Skip if off-screen
-        if not (-100 <= screen_x <= SCREEN_WIDTH + 100 and 
-                -100 <= screen_y <= SCREEN_HEIGHT + 100):
-            return
-        
-        # Dynamic radius based on zoom and mass
-        display_radius = max(3, int(body.radius * (self.zoom / 60)))
-        
-        # Draw glow effect
-        if body.collision_detected:
-            glow_color = (255, 100, 100, 150)
-        else:
-            glow_color = (*body.color, 80)
-        
-        glow_radius = display_radius * 3
-        if glow_radius in self.glow_surfaces:
-            glow_surface = self.glow_surfaces[glow_radius].copy()
-            glow_surface.fill(glow_color, special_flags=pygame.BLEND_RGBA_MULT)
-            self.screen.blit(glow_surface, 
+    def get_visible_bodies(self) -> List[Tuple[Body, int, int, int]]:
+        """Screen-space (body, x, y, display_radius) for on-screen bodies"""
+        visible = []
+        for body in self.current_sim.bodies:
+            screen_x, screen_y = self.world_to_screen(body.x, body.y)
+
+            # Skip if off-screen
+            if not (-100 <= screen_x <= SCREEN_WIDTH + 100 and
+                    -100 <= screen_y <= SCREEN_HEIGHT + 100):
+                continue
+
+            # Dynamic radius based on zoom and mass
+            display_radius = max(3, int(body.radius * (self.zoom / 60)))
+            visible.append((body, screen_x, screen_y, display_radius))
+        return visible
+
+    def draw_glow_pass(self, visible: List[Tuple[Body, int, int, int]]):
+        """Blit all body glows back-to-back so SDL can batch them"""
+        for body, screen_x, screen_y, display_radius in visible:
+            if body.collision_detected:
+                glow_color = (255, 100, 100, 150)
+            else:
+                glow_color = (*body.color, 80)
+
+            # Snap to the nearest pre-computed radius so a glow is always
+            # drawn (the old exact-match lookup silently dropped misses)
+            glow_radius = self._nearest_glow_radius(display_radius * 3)
+
+            # Tinting is memoized - the copy+multiply only runs on cache miss
+            key = (glow_radius, glow_color)
+            glow_surface = self.tinted_glow_cache.get(key)
+            if glow_surface is None:
+                glow_surface = self.glow_surfaces[glow_radius].copy()
+                glow_surface.fill(glow_color, special_flags=pygame.BLEND_RGBA_MULT)
+                self.tinted_glow_cache[key] = glow_surface
+            self.screen.blit(glow_surface,
                            (screen_x - glow_radius * 2, screen_y - glow_radius * 2))
-        
-        # Draw main body with anti-aliasing
-        pygame.gfxdraw.filled_circle(self.screen, screen_x, screen_y, 
-                                   display_radius, body.color)
-        pygame.gfxdraw.aacircle(self.screen, screen_x, screen_y, 
-                               display_radius, WHITE)
-        
-        # Draw core highlight
-        highlight_radius = max(1, display_radius // 3)
-        highlight_color = tuple(min(255, c + 100) for c in body.color)
-        pygame.gfxdraw.filled_circle(self.screen, 
-                                   screen_x - highlight_radius//2, 
-                                   screen_y - highlight_radius//2,
-                                   highlight_radius, highlight_color)
-        
-        # Draw name and info
-        if self.show_info and display_radius > 3:
-            name_surface = self.small_font.render(body.name, True, WHITE)
-            self.screen.blit(name_surface, 
-                           (screen_x + display_radius + 5, screen_y - 8))
-            
-            # Show mass and speed
-            if self.show_physics_debug:
-                speed = body.get_speed()
-                info_text = f"m:{body.mass:.1f} v:{speed:.2f}"
-                info_surface = self.tiny_font.render(info_text, True, (200, 200, 200))
-                self.screen.blit(info_surface, 
-                               (screen_x + display_radius + 5, screen_y + 6))
+
+    def draw_body_pass(self, visible: List[Tuple[Body, int, int, int]]):
+        """Draw all body discs with anti-aliasing"""
+        for body, screen_x, screen_y, display_radius in visible:
+            pygame.gfxdraw.filled_circle(self.screen, screen_x, screen_y,
+                                       display_radius, body.color)
+            pygame.gfxdraw.aacircle(self.screen, screen_x, screen_y,
+                                   display_radius, WHITE)
+
+    def draw_highlight_pass(self, visible: List[Tuple[Body, int, int, int]]):
+        """Draw all core highlights"""
+        for body, screen_x, screen_y, display_radius in visible:
+            highlight_radius = max(1, display_radius // 3)
+            highlight_color = tuple(min(255, c + 100) for c in body.color)
+            pygame.gfxdraw.filled_circle(self.screen,
+                                       screen_x - highlight_radius//2,
+                                       screen_y - highlight_radius//2,
+                                       highlight_radius, highlight_color)
+
+    def draw_label_pass(self, visible: List[Tuple[Body, int, int, int]]):
+        """Draw all body names and debug info"""
+        if not self.show_info or not visible:
+            return
+
+        # All speeds in one vectorized pass instead of per-body sqrt calls
+        speeds = None
+        if self.show_physics_debug:
+            speeds = np.hypot(np.array([body.vx for body, _, _, _ in visible]),
+                              np.array([body.vy for body, _, _, _ in visible]))
+
+        for i, (body, screen_x, screen_y, display_radius) in enumerate(visible):
+            if display_radius > 3:
+                name_surface = self.small_font.render(body.name, True, WHITE)
+                self.screen.blit(name_surface,
+                               (screen_x + display_radius + 5, screen_y - 8))
+
+                # Show mass and speed
+                if self.show_physics_debug:
+                    info_text = f"m:{body.mass:.1f} v:{speeds[i]:.2f}"
+                    info_surface = self.tiny_font.render(info_text, True, (200, 200, 200))
+                    self.screen.blit(info_surface,
+                                   (screen_x + display_radius + 5, screen_y + 6))
     
     def draw_enhanced_trail(self, body: Body):
         """Draw smooth, fading trail with Bezier curves"""
-        if not self.show_trails or len(body.trail) < 3:
+        if not self.show_trails or body.trail_length < 3:
             return
-        
-        # Convert trail to screen coordinates
-        screen_trail = []
-        for x, y in body.trail:
-            sx, sy = self.world_to_screen(x, y)
-            if -200 <= sx <= SCREEN_WIDTH + 200 and -200 <= sy <= SCREEN_HEIGHT + 200:
-                screen_trail.append((sx, sy))
-        
-        if len(screen_trail) < 3:
+
+        # Whole-trail bounding box check: skip the per-point transform when
+        # the trail cannot intersect the (expanded) screen at all
+        min_x, min_y, max_x, max_y = body.trail_aabb
+        left, top = self.world_to_screen(min_x, max_y)
+        right, bottom = self.world_to_screen(max_x, min_y)
+        if (right < -200 or left > SCREEN_WIDTH + 200 or
+                bottom < -200 or top > SCREEN_HEIGHT + 200):
+            return
+
+        # Convert trail to screen coordinates in one vectorized pass
+        sx, sy = self.world_to_screen_array(body.get_trail())
+        mask = ((sx >= -200) & (sx <= SCREEN_WIDTH + 200) &
+                (sy >= -200) & (sy <= SCREEN_HEIGHT + 200))
+        points = np.column_stack((sx[mask], sy[mask]))
+
+        if len(points) < 3:
             return
+
+        # Downsample tightly packed trails: keep points roughly every 2 px of
+        # screen-space arc length, so sub-pixel segments are never drawn
+        diffs = np.diff(points, axis=0)
+        arc_length = np.cumsum(np.hypot(diffs[:, 0], diffs[:, 1]))
+        if arc_length[-1] < 2 * len(points):
+            targets = np.arange(2, arc_length[-1], 2)
+            keep = np.searchsorted(arc_length, targets) + 1
+            keep = np.unique(np.concatenate(([0], keep, [len(points) - 1])))
+            points = points[keep]
+
+        screen_trail = points.tolist()
         
-        # Draw trail segments with varying thickness and alpha
+        # Per-segment alpha and thickness computed in one NumPy pass
         num_points = len(screen_trail)
-        for i in range(1, min(num_points, 500)):  # Limit for performance
-            alpha = int(255 * (i / num_points) * 0.8)
-            thickness = max(1, int(3 * (i / num_points)))
-            
-            # Create color with alpha
-            color = (*body.color, alpha)
-            
-            # Draw anti-aliased line
-            if alpha > 20:  # Skip very transparent segments
-                start_pos = screen_trail[i-1]
-                end_pos = screen_trail[i]
-                
-                # Create surface for alpha blending
-                line_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                pygame.draw.line(line_surface, color, start_pos, end_pos, thickness)
-                self.screen.blit(line_surface, (0, 0))
+        limit = min(num_points, 500)  # Limit for performance
+
+        seg = np.arange(1, limit)
+        alpha = (255 * (seg / num_points) * 0.8).astype(np.int32)
+        thickness = np.maximum(1, 3 * seg // num_points)
+
+        # Group segments into contiguous runs of equal (alpha band, width) -
+        # both are monotone along the trail - and draw each run with one
+        # batched lines call
+        group = (alpha >> 6) * 4 + thickness
+        boundaries = np.flatnonzero(np.diff(group)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(seg)]))
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            mid = (start + end) // 2
+            run_alpha = int(alpha[mid])
+
+            if run_alpha > 20:  # Skip very transparent runs
+                points = screen_trail[seg[start] - 1:seg[end - 1] + 1]
+                pygame.draw.lines(self.trail_surface, (*body.color, run_alpha),
+                                  False, points, int(thickness[mid]))
     
-    def draw_particles(self, body: Body):
-        """Draw particle effects"""
-        if not self.show_particles:
+    def draw_particles(self):
+        """Draw particle effects from the simulation's SoA pool"""
+        pool = self.current_sim.particles
+        alive = np.flatnonzero(pool.alive)
+        if not self.show_particles or len(alive) == 0:
             return
-        
-        for particle in body.particles:
-            screen_x, screen_y = self.world_to_screen(particle.x, particle.y)
-            
-            if 0 <= screen_x <= SCREEN_WIDTH and 0 <= screen_y <= SCREEN_HEIGHT:
-                # Particle alpha based on remaining life
-                alpha = int(255 * (particle.life / particle.max_life))
-                color = (*particle.color, alpha)
-                
-                if alpha > 30:
-                    size = max(1, int(particle.size * (self.zoom / 60)))
-                    particle_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                    pygame.gfxdraw.filled_circle(particle_surface, size, size, size, color)
-                    self.screen.blit(particle_surface, (screen_x - size, screen_y - size))
+
+        # Screen positions, alpha, and sizes for every live particle in
+        # a few array ops; only the blits remain per-particle
+        sx, sy = self.world_to_screen_array(pool.xy[alive])
+        alpha = (255 * pool.life[alive] / pool.max_life[alive]).astype(np.int32)
+        sizes = np.maximum(
+            1, (pool.size[alive] * (self.zoom / 60)).astype(np.int32))
+
+        visible = ((alpha > 30) &
+                   (sx >= 0) & (sx <= SCREEN_WIDTH) &
+                   (sy >= 0) & (sy <= SCREEN_HEIGHT))
+
+        colors = pool.color[alive]
+        for i in np.flatnonzero(visible).tolist():
+            size = int(sizes[i])
+            color = (int(colors[i, 0]), int(colors[i, 1]), int(colors[i, 2]))
+            # Sprites are cached by (size, color, alpha bucket) so the
+            # hot path is a plain blit with no surface allocation
+            key = (size, color, int(alpha[i]) >> 3)
+            particle_surface = self.particle_cache.get(key)
+            if particle_surface is None:
+                particle_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                pygame.gfxdraw.filled_circle(particle_surface, size, size, size,
+                                             (*color, (int(alpha[i]) >> 3) << 3))
+                self.particle_cache[key] = particle_surface
+            self.screen.blit(particle_surface,
+                             (int(sx[i]) - size, int(sy[i]) - size))
     
-    def draw_physics_vectors(self, body: Body):
+    def draw_physics_vectors(self, bodies: List[Body]):
         """Draw force and velocity vectors for physics debugging"""
-        if not (self.show_force_vectors or self.show_velocity_vectors):
+        if not (self.show_force_vectors or self.show_velocity_vectors) or not bodies:
             return
-        
-        screen_x, screen_y = self.world_to_screen(body.x, body.y)
-        
-        # Velocity vector (green)
+
+        positions = np.array([(body.x, body.y) for body in bodies])
+        screen_x, screen_y = self.world_to_screen_array(positions)
+
+        # Velocity vectors (green) - all trig computed in one NumPy pass
         if self.show_velocity_vectors:
             vel_scale = 20
-            vel_end_x = screen_x + int(body.vx * vel_scale)
-            vel_end_y = screen_y - int(body.vy * vel_scale)
-            
-            if math.sqrt(body.vx**2 + body.vy**2) > 0.1:
-                pygame.draw.line(self.screen, GREEN, 
-                               (screen_x, screen_y), (vel_end_x, vel_end_y), 2)
-                # Arrow head
-                angle = math.atan2(-body.vy, body.vx)
-                arrow_length = 8
-                arrow1_x = vel_end_x - arrow_length * math.cos(angle - 0.5)
-                arrow1_y = vel_end_y + arrow_length * math.sin(angle - 0.5)
-                arrow2_x = vel_end_x - arrow_length * math.cos(angle + 0.5)
-                arrow2_y = vel_end_y + arrow_length * math.sin(angle + 0.5)
-                
-                pygame.draw.line(self.screen, GREEN, (vel_end_x, vel_end_y), 
-                               (int(arrow1_x), int(arrow1_y)), 2)
-                pygame.draw.line(self.screen, GREEN, (vel_end_x, vel_end_y), 
-                               (int(arrow2_x), int(arrow2_y)), 2)
-        
-        # Force vector (red)
+            vx = np.array([body.vx for body in bodies])
+            vy = np.array([body.vy for body in bodies])
+            speed = np.hypot(vx, vy)
+
+            vel_end_x = screen_x + (vx * vel_scale).astype(np.int32)
+            vel_end_y = screen_y - (vy * vel_scale).astype(np.int32)
+
+            # Arrow heads
+            angle = np.arctan2(-vy, vx)
+            arrow_length = 8
+            arrow1_x = vel_end_x - arrow_length * np.cos(angle - 0.5)
+            arrow1_y = vel_end_y + arrow_length * np.sin(angle - 0.5)
+            arrow2_x = vel_end_x - arrow_length * np.cos(angle + 0.5)
+            arrow2_y = vel_end_y + arrow_length * np.sin(angle + 0.5)
+
+            for i in range(len(bodies)):
+                if speed[i] > 0.1:
+                    start = (screen_x[i], screen_y[i])
+                    end = (vel_end_x[i], vel_end_y[i])
+                    pygame.draw.line(self.screen, GREEN, start, end, 2)
+                    pygame.draw.line(self.screen, GREEN, end,
+                                   (int(arrow1_x[i]), int(arrow1_y[i])), 2)
+                    pygame.draw.line(self.screen, GREEN, end,
+                                   (int(arrow2_x[i]), int(arrow2_y[i])), 2)
+
+        # Force vectors (red)
         if self.show_force_vectors:
             force_scale = 10
-            force_end_x = screen_x + int(body.acceleration_x * force_scale)
-            force_end_y = screen_y - int(body.acceleration_y * force_scale)
-            
-            if math.sqrt(body.acceleration_x**2 + body.acceleration_y**2) > 0.01:
-                pygame.draw.line(self.screen, RED, 
-                               (screen_x, screen_y), (force_end_x, force_end_y), 2)
+            acc_x = np.array([body.acceleration_x for body in bodies])
+            acc_y = np.array([body.acceleration_y for body in bodies])
+            acc_mag = np.hypot(acc_x, acc_y)
+
+            force_end_x = screen_x + (acc_x * force_scale).astype(np.int32)
+            force_end_y = screen_y - (acc_y * force_scale).astype(np.int32)
+
+            for i in range(len(bodies)):
+                if acc_mag[i] > 0.01:
+                    pygame.draw.line(self.screen, RED,
+                                   (screen_x[i], screen_y[i]),
+                                   (force_end_x[i], force_end_y[i]), 2)
     
     def draw_center_of_mass(self):
         """Draw center of mass indicator"""
@@ -367,70 +524,67 @@ class AdvancedRenderer:
         if not self.show_info:
             return
         
-        # Main info panel
-        panel_width = 350
-        panel_height = 280
-        panel_rect = pygame.Rect(10, 10, panel_width, panel_height)
-        
-        # Semi-transparent background
-        panel_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
-        pygame.draw.rect(panel_surface, UI_BACKGROUND, panel_surface.get_rect())
-        pygame.draw.rect(panel_surface, WHITE, panel_surface.get_rect(), 2)
-        self.screen.blit(panel_surface, panel_rect.topleft)
+        # Main info panel (persistent surface, painted once in __init__)
+        panel_rect = pygame.Rect(10, 10, 350, 280)
+        self.screen.blit(self._main_panel_surf, panel_rect.topleft)
         
         # Title
         title_text = self.font.render(f"Three-Body Simulation", True, WHITE)
         self.screen.blit(title_text, (20, 20))
         
-        # Simulation info
+        # Simulation info (dynamic lines re-rendered each frame)
         y_offset = 50
         info_lines = [
             f"Scenario: {self.current_scenario}",
             f"Time: {self.current_sim.time:.3f}s",
             f"Timestep: {self.current_sim.current_dt:.6f}",
             f"Speed: {self.simulation_speed:.1f}x",
-            f"FPS: {self.current_fps:.1f}",
-            f"Zoom: {self.zoom:.1f}",
-            f"Integration: {self.current_sim.settings.integration_method}",
-            "",
-            "Controls:",
-            "SPACE - Pause/Resume", "R - Reset", "T - Toggle trails",
-            "I - Toggle info", "G - Toggle grid", "P - Toggle particles",
-            "F - Toggle force vectors", "V - Toggle velocity vectors",
-            "C - Toggle center of mass", "D - Toggle debug mode",
-            "1,2,3 - Switch scenarios", "+/- - Speed control",
-            "Mouse wheel - Zoom", "Drag - Pan camera",
-            "F1-F3 - Follow body", "F4 - Free camera"
         ]
-        
+
         for line in info_lines:
-            if line:
-                if line.startswith("Controls:"):
-                    text_surface = self.small_font.render(line, True, YELLOW)
-                else:
-                    text_surface = self.tiny_font.render(line, True, WHITE)
-                self.screen.blit(text_surface, (20, y_offset))
+            text_surface = self.tiny_font.render(line, True, WHITE)
+            self.screen.blit(text_surface, (20, y_offset))
+            y_offset += 12
+
+        # FPS text only re-renders when the rounded value changes
+        fps_value = int(self.current_fps)
+        if fps_value != self._fps_value:
+            self._fps_surface = self.tiny_font.render(f"FPS: {fps_value}", True, WHITE)
+            self._fps_value = fps_value
+        self.screen.blit(self._fps_surface, (20, y_offset))
+        y_offset += 12
+
+        for line in [f"Zoom: {self.zoom:.1f}",
+                     f"Integration: {self.current_sim.settings.integration_method}"]:
+            text_surface = self.tiny_font.render(line, True, WHITE)
+            self.screen.blit(text_surface, (20, y_offset))
+            y_offset += 12
+
+        # Control help, pre-rendered in __init__
+        y_offset += 12
+        self.screen.blit(self._controls_title, (20, y_offset))
+        y_offset += 12
+        for help_surface in self._help_surfaces:
+            self.screen.blit(help_surface, (20, y_offset))
             y_offset += 12
         
         # Performance panel
         if self.show_physics_debug:
             perf_panel = pygame.Rect(SCREEN_WIDTH - 250, 10, 240, 150)
-            perf_surface = pygame.Surface((240, 150), pygame.SRCALPHA)
-            pygame.draw.rect(perf_surface, UI_BACKGROUND, perf_surface.get_rect())
-            pygame.draw.rect(perf_surface, GREEN, perf_surface.get_rect(), 2)
-            self.screen.blit(perf_surface, perf_panel.topleft)
+            self.screen.blit(self._perf_panel_surf, perf_panel.topleft)
             
             perf_title = self.small_font.render("Performance", True, GREEN)
             self.screen.blit(perf_title, (SCREEN_WIDTH - 240, 20))
             
             # Performance metrics
             perf_y = 45
-            avg_frame_time = sum(self.frame_times[-30:]) / max(len(self.frame_times[-30:]), 1)
+            recent_frames = list(self.frame_times)[-30:]
+            avg_frame_time = sum(recent_frames) / max(len(recent_frames), 1)
             perf_lines = [
                 f"Frame time: {avg_frame_time*1000:.1f}ms",
                 f"Bodies: {len(self.current_sim.bodies)}",
-                f"Particles: {sum(len(b.particles) for b in self.current_sim.bodies)}",
-                f"Trail points: {sum(len(b.trail) for b in self.current_sim.bodies)}",
+                f"Particles: {self.current_sim.particles.count}",
+                f"Trail points: {sum(b.trail_length for b in self.current_sim.bodies)}",
                 f"Collisions: {len(self.current_sim.collision_events)}"
             ]
             
@@ -442,9 +596,7 @@ class AdvancedRenderer:
         # Energy conservation panel
         if len(self.current_sim.energy_history) > 1:
             energy_panel = pygame.Rect(SCREEN_WIDTH - 280, SCREEN_HEIGHT - 120, 270, 110)
-            energy_surface = pygame.Surface((270, 110), pygame.SRCALPHA)
-            pygame.draw.rect(energy_surface, UI_BACKGROUND, energy_surface.get_rect())
-            
+
             initial_energy = self.current_sim.energy_history[0]
             current_energy = self.current_sim.energy_history[-1]
             energy_drift = abs((current_energy - initial_energy) / initial_energy) * 100 if initial_energy != 0 else 0
@@ -457,7 +609,10 @@ class AdvancedRenderer:
             else:
                 border_color = RED
             
-            pygame.draw.rect(energy_surface, border_color, energy_surface.get_rect(), 2)
+            energy_surface = self._energy_panel_surfs.get(border_color)
+            if energy_surface is None:
+                energy_surface = self._make_panel_surface(270, 110, border_color)
+                self._energy_panel_surfs[border_color] = energy_surface
             self.screen.blit(energy_surface, energy_panel.topleft)
             
             energy_title = self.small_font.render("Conservation", True, border_color)
@@ -595,52 +750,67 @@ class AdvancedRenderer:
         self.target_zoom = 60.0
         self.camera_follow_mode = 0
     
-    def update_simulation(self):
-        """Update physics with performance monitoring"""
-        start_time = time.time()
-        
-        # Multiple physics steps for higher simulation speed
-        steps = max(1, int(self.simulation_speed))
-        for _ in range(steps):
-            self.current_sim.step()
-        
-        # Handle fractional speed
-        fractional = self.simulation_speed - int(self.simulation_speed)
-        if fractional > 0 and np.random.random() < fractional:
-            self.current_sim.step()
-        
-        physics_time = time.time() - start_time
-        self.physics_times.append(physics_time)
-        if len(self.physics_times) > 60:
-            self.physics_times.pop(0)
+    def update_simulation(self, frame_time: float):
+        """Update physics with a fixed-timestep accumulator
+
+        Physics advances in whole current_dt steps as scaled wall-clock
+        time accrues, so the simulation rate is independent of how fast
+        the renderer happens to be running.
+        """
+        if self.current_sim.paused:
+            self._physics_accumulator = 0.0
+            return
+
+        start_time = time.time() if self.show_physics_debug else 0.0
+
+        self._physics_accumulator += frame_time * self.simulation_speed
+        dt = self.current_sim.current_dt
+        steps = int(self._physics_accumulator / dt)
+
+        if steps > self._max_steps_per_frame:
+            # Physics can't keep up - drop the backlog instead of spiraling
+            steps = self._max_steps_per_frame
+            self._physics_accumulator = 0.0
+        else:
+            self._physics_accumulator -= steps * dt
+
+        if steps > 0:
+            self.current_sim.step_batch(steps)
+
+        if self.show_physics_debug:
+            self.physics_times.append(time.time() - start_time)
     
     def render_frame(self):
         """Render complete frame with all effects"""
-        render_start = time.time()
-        
+        render_start = time.time() if self.show_physics_debug else 0.0
+
         # Update camera
         self.update_camera()
         
         # Draw background
         self.draw_background()
         
-        # Draw trails (behind bodies)
+        # Draw trails (behind bodies) - all bodies share one alpha surface
         if self.show_trails:
+            self.trail_surface.fill((0, 0, 0, 0))
             for body in self.current_sim.bodies:
                 self.draw_enhanced_trail(body)
+            self.screen.blit(self.trail_surface, (0, 0))
         
         # Draw particles
         if self.show_particles:
-            for body in self.current_sim.bodies:
-                self.draw_particles(body)
+            self.draw_particles()
         
         # Draw center of mass
         self.draw_center_of_mass()
         
-        # Draw bodies
-        for body in self.current_sim.bodies:
-            self.draw_enhanced_body(body)
-            self.draw_physics_vectors(body)
+        # Draw bodies in passes so same-texture blits land back-to-back
+        visible = self.get_visible_bodies()
+        self.draw_glow_pass(visible)
+        self.draw_body_pass(visible)
+        self.draw_highlight_pass(visible)
+        self.draw_label_pass(visible)
+        self.draw_physics_vectors(self.current_sim.bodies)
         
         # Draw UI
         self.draw_enhanced_ui()
@@ -648,10 +818,8 @@ class AdvancedRenderer:
         # Update display
         pygame.display.flip()
         
-        render_time = time.time() - render_start
-        self.render_times.append(render_time)
-        if len(self.render_times) > 60:
-            self.render_times.pop(0)
+        if self.show_physics_debug:
+            self.render_times.append(time.time() - render_start)
     
     def run(self):
         """Main enhanced simulation loop"""
@@ -661,28 +829,25 @@ class AdvancedRenderer:
         
         running = True
         frame_start_time = time.time()
-        
+
         while running:
             current_time = time.time()
-            
+            frame_time = current_time - frame_start_time
+            frame_start_time = current_time
+
             # Handle events
             running = self.handle_events()
-            
-            # Update physics
-            self.update_simulation()
-            
+
+            # Update physics by however much scaled time the frame took
+            self.update_simulation(frame_time)
+
             # Render frame
             self.render_frame()
-            
+
             # Performance tracking
-            frame_time = current_time - frame_start_time
             self.frame_times.append(frame_time)
-            if len(self.frame_times) > 60:
-                self.frame_times.pop(0)
-            
             self.current_fps = 1.0 / max(frame_time, 0.001)
-            frame_start_time = current_time
-            
+
             # Control frame rate
             self.clock.tick(self.target_fps)
         
@@ -692,6 +857,12 @@ class AdvancedRenderer:
 def main():
     """Enhanced entry point"""
     try:
+        # Experimental GPU texture renderer (see sdl2_renderer.py)
+        if os.environ.get("THREE_BODY_SDL2") == "1":
+            from sdl2_renderer import TextureRenderer
+            TextureRenderer().run()
+            return
+
         print("🌟 Initializing Enhanced Three-Body Simulation...")
         renderer = AdvancedRenderer()
         renderer.run()
@@ -0,0 +1,154 @@
+"""
+Experimental SDL2 Texture Renderer Prototype
+Draws the hot paths (bodies, glows, trails, particles) through
+pygame._sdl2 Renderer/Texture objects so pixel work runs on the GPU
+instead of pygame's software surface blits.
+
+Opt in with THREE_BODY_SDL2=1, or run this module directly. Feature
+coverage is intentionally minimal (no UI panels, no camera controls);
+the point is to measure what the texture path buys before porting the
+full renderer.
+"""
+
+import sys
+import time
+import numpy as np
+import pygame
+import pygame.gfxdraw
+
+from pygame._sdl2.video import Window, Renderer, Texture
+
+from three_body_sim import Body, create_enhanced_figure_eight
+
+SCREEN_WIDTH = 1400
+SCREEN_HEIGHT = 900
+BACKGROUND_COLOR = (5, 5, 15, 255)
+WHITE = (255, 255, 255)
+
+
+class TextureRenderer:
+    """Prototype renderer built on SDL2 textures"""
+
+    def __init__(self, sim=None):
+        pygame.init()
+        self.window = Window("Three-Body Simulation - SDL2 Prototype",
+                             size=(SCREEN_WIDTH, SCREEN_HEIGHT))
+        try:
+            self.renderer = Renderer(self.window, accelerated=1, vsync=False)
+        except Exception:
+            # No accelerated driver available - take whatever SDL offers
+            self.renderer = Renderer(self.window, accelerated=-1)
+
+        self.sim = sim or create_enhanced_figure_eight()
+        self.clock = pygame.time.Clock()
+
+        self.zoom = 60.0
+        self.center_x = SCREEN_WIDTH // 2
+        self.center_y = SCREEN_HEIGHT // 2
+
+        # Sprites are rasterized once and uploaded as textures; every
+        # frame after that is pure texture draws
+        self._sprite_cache = {}
+
+    def world_to_screen(self, x: float, y: float):
+        return (int(self.center_x + x * self.zoom),
+                int(self.center_y - y * self.zoom))
+
+    def _circle_texture(self, radius: int, color, alpha: int = 255) -> Texture:
+        """Cached filled-circle texture keyed by (radius, color, alpha)"""
+        key = (radius, color, alpha)
+        texture = self._sprite_cache.get(key)
+        if texture is None:
+            surface = pygame.Surface((radius * 2 + 2, radius * 2 + 2), pygame.SRCALPHA)
+            pygame.gfxdraw.filled_circle(surface, radius + 1, radius + 1, radius,
+                                         (*color, alpha))
+            texture = Texture.from_surface(self.renderer, surface)
+            self._sprite_cache[key] = texture
+        return texture
+
+    def draw_trail(self, body: Body):
+        trail = body.get_trail()
+        if len(trail) < 2:
+            return
+
+        # Renderer lines carry no per-segment alpha; fade via draw_color
+        # in a few bands like the surface path does
+        num_points = len(trail)
+        self.renderer.draw_color = (*body.color, 255)
+        previous = self.world_to_screen(trail[0, 0], trail[0, 1])
+        for i in range(1, num_points):
+            current = self.world_to_screen(trail[i, 0], trail[i, 1])
+            alpha = int(255 * (i / num_points) * 0.8)
+            if alpha > 20:
+                self.renderer.draw_color = (*body.color, alpha)
+                self.renderer.draw_line(previous, current)
+            previous = current
+
+    def draw_body(self, body: Body):
+        screen_x, screen_y = self.world_to_screen(body.x, body.y)
+        display_radius = max(3, int(body.radius * (self.zoom / 60)))
+
+        # Glow, then disc, as texture draws
+        glow_radius = display_radius * 3
+        glow = self._circle_texture(glow_radius, body.color, 40)
+        glow.draw(dstrect=(screen_x - glow_radius, screen_y - glow_radius,
+                           glow_radius * 2, glow_radius * 2))
+
+        disc = self._circle_texture(display_radius, body.color)
+        disc.draw(dstrect=(screen_x - display_radius, screen_y - display_radius,
+                           display_radius * 2, display_radius * 2))
+
+    def draw_particles(self):
+        pool = self.sim.particles
+        for i in np.flatnonzero(pool.alive).tolist():
+            screen_x, screen_y = self.world_to_screen(
+                float(pool.xy[i, 0]), float(pool.xy[i, 1]))
+            alpha = int(255 * (pool.life[i] / pool.max_life[i]))
+            if alpha > 30:
+                size = max(1, int(pool.size[i] * (self.zoom / 60)))
+                color = tuple(int(c) for c in pool.color[i])
+                sprite = self._circle_texture(size, color, (alpha >> 3) << 3)
+                sprite.draw(dstrect=(screen_x - size, screen_y - size,
+                                     size * 2, size * 2))
+
+    def run(self):
+        print("🧪 SDL2 texture renderer prototype - press ESC or close to quit")
+        running = True
+        frame_start_time = time.time()
+
+        while running:
+            current_time = time.time()
+            frame_time = current_time - frame_start_time
+            frame_start_time = current_time
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    running = False
+
+            steps = int(frame_time * 2.0 / self.sim.current_dt)
+            self.sim.step_batch(min(steps, 1000))
+
+            self.renderer.draw_color = BACKGROUND_COLOR
+            self.renderer.clear()
+
+            for body in self.sim.bodies:
+                self.draw_trail(body)
+            self.draw_particles()
+            for body in self.sim.bodies:
+                self.draw_body(body)
+
+            self.renderer.present()
+            self.clock.tick(120)
+
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    try:
+        TextureRenderer().run()
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        pygame.quit()
+        sys.exit(1)
@@ -1,6 +1,13 @@
 """
 Enhanced Three-Body Problem Simulation Engine
 High-performance gravitational physics with multiple integration methods
+
+Precision boundary: integration state (positions, velocities, masses)
+is float64 end to end - the kernels depend on it for energy
+conservation. Everything that exists only to be drawn (trail ring
+buffers, the particle pool) is float32, which halves the memory traffic
+on the renderer-facing buffers and is more precision than a screen
+pixel can show.
 """
 
 import numpy as np
@@ -9,6 +16,22 @@ import random
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
+# Numba is optional - fall back to pure Python/NumPy if unavailable
+try:
+    from numba import njit, prange, set_num_threads
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return decorator
+    def set_num_threads(n):
+        pass
+
 @dataclass
 class PhysicsSettings:
     """Configuration for physics simulation"""
@@ -21,47 +44,383 @@ class PhysicsSettings:
     softening_parameter: float = 0.01
     energy_conservation_check: bool = True
 
-class Particle:
-    """Individual particle for trail effects"""
-    def __init__(self, x: float, y: float, life: float, color: Tuple[int, int, int]):
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-0.1, 0.1)
-        self.vy = random.uniform(-0.1, 0.1)
-        self.life = life
-        self.max_life = life
-        self.color = color
-        self.size = random.uniform(1, 3)
-    
+# Below this many bodies, thread dispatch costs more than the force loop
+_PARALLEL_THRESHOLD = 64
+
+# Explicit signatures make every kernel compile eagerly at import
+# instead of stalling the first frame; cache=True persists the compiled
+# code in __pycache__ so later sessions skip the compile entirely.
+# (Set NUMBA_CACHE_DIR to a writable path when running from a read-only
+# install.)
+_ACC_SIG = "float64[:, :](float64[:, :], float64[:], float64, float64)"
+
+@njit(_ACC_SIG, cache=True, fastmath=True)
+def _compute_accelerations_serial(pos, mass, eps2, G):
+    """Softened pairwise gravitational accelerations, compiled to machine code
+
+    Each pair is evaluated once (j > i) and applied to both bodies with
+    opposite signs - Newton's third law halves the sqrt count, the
+    expensive op per pair. math.sqrt lowers to an LLVM intrinsic under
+    fastmath.
+    """
+    n = pos.shape[0]
+    acc = np.zeros((n, 2))
+    for i in range(n):
+        xi = pos[i, 0]
+        yi = pos[i, 1]
+        for j in range(i + 1, n):
+            dx = pos[j, 0] - xi
+            dy = pos[j, 1] - yi
+            r2 = dx * dx + dy * dy + eps2
+            r1i = 1.0 / math.sqrt(r2)
+            s = G * r1i * r1i * r1i
+            fx = s * dx
+            fy = s * dy
+            acc[i, 0] += mass[j] * fx
+            acc[i, 1] += mass[j] * fy
+            acc[j, 0] -= mass[i] * fx
+            acc[j, 1] -= mass[i] * fy
+    return acc
+
+@njit(_ACC_SIG, parallel=True, fastmath=True, cache=True, nogil=True)
+def _compute_accelerations_parallel(pos, mass, eps2, G):
+    """Thread-parallel variant: each outer iteration writes only acc[i]
+
+    Keeps the full i/j double loop - applying Newton's third law here
+    would race on acc[j] across threads, and the halved arithmetic is
+    not worth per-thread accumulator buffers at the sizes that reach
+    this kernel.
+    """
+    n = pos.shape[0]
+    acc = np.zeros((n, 2))
+    for i in prange(n):
+        ax, ay = 0.0, 0.0
+        xi = pos[i, 0]
+        yi = pos[i, 1]
+        for j in range(n):
+            if i != j:
+                dx = pos[j, 0] - xi
+                dy = pos[j, 1] - yi
+                r2 = dx * dx + dy * dy + eps2
+                r1i = 1.0 / math.sqrt(r2)
+                r3i = r1i * r1i * r1i
+                mr3i = G * mass[j] * r3i
+                ax += mr3i * dx
+                ay += mr3i * dy
+        acc[i, 0] = ax
+        acc[i, 1] = ay
+    return acc
+
+@njit(_ACC_SIG, cache=True, fastmath=True)
+def _compute_accelerations(pos, mass, eps2, G):
+    """Dispatch to the parallel kernel only when N can amortize threads"""
+    if pos.shape[0] >= _PARALLEL_THRESHOLD:
+        return _compute_accelerations_parallel(pos, mass, eps2, G)
+    return _compute_accelerations_serial(pos, mass, eps2, G)
+
+def set_physics_threads(n: int):
+    """Set the thread count used by the parallel acceleration kernel"""
+    set_num_threads(n)
+
+def _compute_accelerations_numpy(pos, mass, eps2, G):
+    """Broadcast fallback used when Numba is not installed"""
+    diff = pos[None, :, :] - pos[:, None, :]
+    r_squared = (diff ** 2).sum(-1) + eps2
+    inv_r3 = r_squared ** -1.5
+    np.fill_diagonal(inv_r3, 0.0)
+    return G * (inv_r3[:, :, None] * diff * mass[None, :, None]).sum(axis=1)
+
+if not NUMBA_AVAILABLE:
+    _compute_accelerations = _compute_accelerations_numpy
+
+@njit("float64[:, :](float64[:, :], float64[:], float64, float64, float64)",
+      cache=True, fastmath=True)
+def _rk4_step(state, mass, eps2, G, dt):
+    """Fused RK4 step: all four substages in one compiled call
+
+    Mutates the (N, 4) state array in place and returns the stage-1
+    accelerations for force visualization. Fusing the stages keeps the
+    intermediate k arrays local to the kernel instead of round-tripping
+    through Python between derivative evaluations.
+    """
+    pos = state[:, :2]
+    vel = state[:, 2:]
+
+    k1v = _compute_accelerations(pos, mass, eps2, G)
+    k1p = vel
+    k2p = vel + 0.5 * dt * k1v
+    k2v = _compute_accelerations(pos + 0.5 * dt * k1p, mass, eps2, G)
+    k3p = vel + 0.5 * dt * k2v
+    k3v = _compute_accelerations(pos + 0.5 * dt * k2p, mass, eps2, G)
+    k4p = vel + dt * k3v
+    k4v = _compute_accelerations(pos + dt * k3p, mass, eps2, G)
+
+    pos += (dt / 6.0) * (k1p + 2 * k2p + 2 * k3p + k4p)
+    vel += (dt / 6.0) * (k1v + 2 * k2v + 2 * k3v + k4v)
+    return k1v
+
+@njit(cache=True, fastmath=True, inline='always')
+def _acc3(x0, y0, x1, y1, x2, y2, m0, m1, m2, eps2, G):
+    """Three-body accelerations with each pair evaluated once
+
+    Newton's third law: one distance evaluation per pair feeds both
+    bodies with opposite signs, so the canonical N=3 case costs three
+    pair terms instead of six.
+    """
+    # Pair (0, 1)
+    dx = x1 - x0
+    dy = y1 - y0
+    r2 = dx * dx + dy * dy + eps2
+    r1i = 1.0 / math.sqrt(r2)
+    s = G * r1i * r1i * r1i
+    ax0 = s * m1 * dx
+    ay0 = s * m1 * dy
+    ax1 = -s * m0 * dx
+    ay1 = -s * m0 * dy
+
+    # Pair (0, 2)
+    dx = x2 - x0
+    dy = y2 - y0
+    r2 = dx * dx + dy * dy + eps2
+    r1i = 1.0 / math.sqrt(r2)
+    s = G * r1i * r1i * r1i
+    ax0 += s * m2 * dx
+    ay0 += s * m2 * dy
+    ax2 = -s * m0 * dx
+    ay2 = -s * m0 * dy
+
+    # Pair (1, 2)
+    dx = x2 - x1
+    dy = y2 - y1
+    r2 = dx * dx + dy * dy + eps2
+    r1i = 1.0 / math.sqrt(r2)
+    s = G * r1i * r1i * r1i
+    ax1 += s * m2 * dx
+    ay1 += s * m2 * dy
+    ax2 -= s * m1 * dx
+    ay2 -= s * m1 * dy
+
+    return ax0, ay0, ax1, ay1, ax2, ay2
+
+@njit("float64[:, :](float64[:, :], float64, float64, float64, float64, "
+      "float64, float64)", cache=True, fastmath=True)
+def _rk4_step_n3(state, m0, m1, m2, eps2, G, dt):
+    """Fully unrolled RK4 step for exactly three bodies
+
+    The whole step runs on scalars - no loops, no intermediate arrays -
+    so state and pair terms stay in registers across all four substages.
+    Mutates state in place and returns the stage-1 accelerations like
+    _rk4_step.
+    """
+    x0 = state[0, 0]; y0 = state[0, 1]; vx0 = state[0, 2]; vy0 = state[0, 3]
+    x1 = state[1, 0]; y1 = state[1, 1]; vx1 = state[1, 2]; vy1 = state[1, 3]
+    x2 = state[2, 0]; y2 = state[2, 1]; vx2 = state[2, 2]; vy2 = state[2, 3]
+
+    h = 0.5 * dt
+
+    # Stage 1 at the current positions
+    a1x0, a1y0, a1x1, a1y1, a1x2, a1y2 = _acc3(
+        x0, y0, x1, y1, x2, y2, m0, m1, m2, eps2, G)
+
+    # Stage 2 at p + h*v
+    a2x0, a2y0, a2x1, a2y1, a2x2, a2y2 = _acc3(
+        x0 + h * vx0, y0 + h * vy0,
+        x1 + h * vx1, y1 + h * vy1,
+        x2 + h * vx2, y2 + h * vy2, m0, m1, m2, eps2, G)
+
+    # Stage 3 at p + h*(v + h*a1)
+    a3x0, a3y0, a3x1, a3y1, a3x2, a3y2 = _acc3(
+        x0 + h * (vx0 + h * a1x0), y0 + h * (vy0 + h * a1y0),
+        x1 + h * (vx1 + h * a1x1), y1 + h * (vy1 + h * a1y1),
+        x2 + h * (vx2 + h * a1x2), y2 + h * (vy2 + h * a1y2),
+        m0, m1, m2, eps2, G)
+
+    # Stage 4 at p + dt*(v + h*a2)
+    a4x0, a4y0, a4x1, a4y1, a4x2, a4y2 = _acc3(
+        x0 + dt * (vx0 + h * a2x0), y0 + dt * (vy0 + h * a2y0),
+        x1 + dt * (vx1 + h * a2x1), y1 + dt * (vy1 + h * a2y1),
+        x2 + dt * (vx2 + h * a2x2), y2 + dt * (vy2 + h * a2y2),
+        m0, m1, m2, eps2, G)
+
+    # Combine: position slopes are v, v + h*a1, v + h*a2, v + dt*a3
+    w = dt / 6.0
+    state[0, 0] = x0 + w * (6.0 * vx0 + dt * (a1x0 + a2x0 + a3x0))
+    state[0, 1] = y0 + w * (6.0 * vy0 + dt * (a1y0 + a2y0 + a3y0))
+    state[1, 0] = x1 + w * (6.0 * vx1 + dt * (a1x1 + a2x1 + a3x1))
+    state[1, 1] = y1 + w * (6.0 * vy1 + dt * (a1y1 + a2y1 + a3y1))
+    state[2, 0] = x2 + w * (6.0 * vx2 + dt * (a1x2 + a2x2 + a3x2))
+    state[2, 1] = y2 + w * (6.0 * vy2 + dt * (a1y2 + a2y2 + a3y2))
+    state[0, 2] = vx0 + w * (a1x0 + 2.0 * a2x0 + 2.0 * a3x0 + a4x0)
+    state[0, 3] = vy0 + w * (a1y0 + 2.0 * a2y0 + 2.0 * a3y0 + a4y0)
+    state[1, 2] = vx1 + w * (a1x1 + 2.0 * a2x1 + 2.0 * a3x1 + a4x1)
+    state[1, 3] = vy1 + w * (a1y1 + 2.0 * a2y1 + 2.0 * a3y1 + a4y1)
+    state[2, 2] = vx2 + w * (a1x2 + 2.0 * a2x2 + 2.0 * a3x2 + a4x2)
+    state[2, 3] = vy2 + w * (a1y2 + 2.0 * a2y2 + 2.0 * a3y2 + a4y2)
+
+    acc = np.empty((3, 2))
+    acc[0, 0] = a1x0; acc[0, 1] = a1y0
+    acc[1, 0] = a1x1; acc[1, 1] = a1y1
+    acc[2, 0] = a1x2; acc[2, 1] = a1y2
+    return acc
+
+@njit("float64[:, :](float64[:, :], float64[:], float64, int64, float64, "
+      "float64, int64)", cache=True, fastmath=True)
+def step_many(state, mass, dt, n_steps, eps2, G, method):
+    """Advance the system n_steps in one compiled call (method 0: Leapfrog, 1: RK4)
+
+    Mutates the (N, 4) state array in place and returns the final
+    accelerations.
+    """
+    pos = state[:, :2]
+    vel = state[:, 2:]
+    for _ in range(n_steps):
+        if method == 0:
+            # Leapfrog: half kick, drift, half kick
+            vel += 0.5 * dt * _compute_accelerations(pos, mass, eps2, G)
+            pos += dt * vel
+            vel += 0.5 * dt * _compute_accelerations(pos, mass, eps2, G)
+        elif state.shape[0] == 3:
+            _rk4_step_n3(state, mass[0], mass[1], mass[2], eps2, G, dt)
+        else:
+            _rk4_step(state, mass, eps2, G, dt)
+    return _compute_accelerations(pos, mass, eps2, G)
+
+@njit("Tuple((float64[:, :], float64, float64, float64, float64))"
+      "(float64[:, :], float64[:], float64, float64, float64, int64)",
+      cache=True, fastmath=True)
+def _advance(state, mass, eps2, G, dt, method):
+    """One physics step plus center-of-mass, in a single compiled call
+
+    Mutates the (N, 4) state in place (method 0: Leapfrog, 1: RK4, with
+    the unrolled N=3 path when it applies) and computes the
+    mass-weighted centroids in the same function, so the state never
+    leaves cache between integration and bookkeeping. Returns
+    (acc, com_x, com_y, com_vx, com_vy).
+    """
+    n = state.shape[0]
+    pos = state[:, :2]
+    vel = state[:, 2:]
+
+    if method == 0:
+        # Leapfrog: half kick, drift, half kick
+        vel += 0.5 * dt * _compute_accelerations(pos, mass, eps2, G)
+        pos += dt * vel
+        acc = _compute_accelerations(pos, mass, eps2, G)
+        vel += 0.5 * dt * acc
+    elif n == 3:
+        acc = _rk4_step_n3(state, mass[0], mass[1], mass[2], eps2, G, dt)
+    else:
+        acc = _rk4_step(state, mass, eps2, G, dt)
+
+    total_mass = 0.0
+    com_x = com_y = com_vx = com_vy = 0.0
+    for i in range(n):
+        m = mass[i]
+        total_mass += m
+        com_x += m * state[i, 0]
+        com_y += m * state[i, 1]
+        com_vx += m * state[i, 2]
+        com_vy += m * state[i, 3]
+    inv_mass = 1.0 / total_mass
+
+    return (acc, com_x * inv_mass, com_y * inv_mass,
+            com_vx * inv_mass, com_vy * inv_mass)
+
+
+MAX_PARTICLES = 4096
+
+class ParticlePool:
+    """SoA pool holding every trail particle in a simulation
+
+    One set of preallocated arrays replaces per-body lists of particle
+    objects: the per-step update is a handful of whole-array operations
+    and dead slots are recycled through a free list, so emission and
+    expiry never allocate.
+    """
+
+    def __init__(self, capacity: int = MAX_PARTICLES):
+        self.capacity = capacity
+        self.xy = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.size = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._free = list(range(capacity - 1, -1, -1))
+
+    @property
+    def count(self) -> int:
+        """Number of live particles"""
+        return self.capacity - len(self._free)
+
+    def emit(self, x: float, y: float, life: float,
+             color: Tuple[int, int, int]):
+        """Fill a free slot; drops the particle when the pool is full"""
+        if not self._free:
+            return
+        i = self._free.pop()
+        self.xy[i] = (x, y)
+        self.vel[i] = (random.uniform(-0.1, 0.1), random.uniform(-0.1, 0.1))
+        self.life[i] = life
+        self.max_life[i] = life
+        self.size[i] = random.uniform(1, 3)
+        self.color[i] = color
+        self.alive[i] = True
+
     def update(self, dt: float):
-        self.x += self.vx * dt
-        self.y += self.vy * dt
+        """Advance all particles with whole-array operations
+
+        Dead slots are updated along with live ones - branch-free math on
+        the full arrays is cheaper than masking at these sizes.
+        """
+        if self.capacity == len(self._free):
+            return
+        self.xy += self.vel * dt
+        self.vel *= 0.98  # Friction
         self.life -= dt
-        self.vx *= 0.98  # Friction
-        self.vy *= 0.98
+        dead = self.alive & (self.life <= 0)
+        if dead.any():
+            self.alive[dead] = False
+            self._free.extend(np.flatnonzero(dead).tolist())
+
+    def clear(self):
+        """Kill every particle and return all slots to the free list"""
+        self.alive[:] = False
+        self._free = list(range(self.capacity - 1, -1, -1))
 
 class Body:
     """Enhanced celestial body with particle effects and physics tracking"""
     
     def __init__(self, mass: float, x: float, y: float, vx: float, vy: float, 
-                 color: Tuple[int, int, int] = (255, 255, 255), 
+                 color: Tuple[int, int, int] = (255, 255, 255),
                  radius: float = 5, name: str = "Body"):
         self.mass = mass
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
+        # State row [x, y, vx, vy]; once the body joins a simulation this
+        # becomes a view into the simulation's SoA state array, so the
+        # attribute properties below read/write shared memory directly
+        self._state = np.array([x, y, vx, vy], dtype=np.float64)
         self.color = color
         self.radius = radius
         self.name = name
         
-        # Enhanced trail system
-        self.trail = []
+        # Enhanced trail system (fixed-size ring buffer, oldest point
+        # first; float32 - display-only data, see module docstring)
         self.max_trail_length = 1000
         self.trail_quality = 3  # Points per frame
+        self._trail_buf = np.empty((self.max_trail_length, 2), dtype=np.float32)
+        self._trail_scratch = np.empty((0, 2), dtype=np.float32)
+        self._trail_head = 0
+        self._trail_count = 0
+        # World-space bounding box, maintained incrementally on push.
+        # Conservative: it never shrinks as old points are overwritten.
+        self._trail_min_x = math.inf
+        self._trail_min_y = math.inf
+        self._trail_max_x = -math.inf
+        self._trail_max_y = -math.inf
         
-        # Particle effects
-        self.particles: List[Particle] = []
+        # Particle effects (emitted into the simulation's shared pool)
+        self._particle_pool: Optional[ParticlePool] = None
         self.particle_emission_rate = 2.0
         self.particle_timer = 0.0
         
@@ -80,73 +439,165 @@ class Body:
         # Collision detection
         self.collision_detected = False
         self.collision_timer = 0.0
-    
+
+    @property
+    def x(self) -> float:
+        return self._state[0]
+
+    @x.setter
+    def x(self, value: float):
+        self._state[0] = value
+
+    @property
+    def y(self) -> float:
+        return self._state[1]
+
+    @y.setter
+    def y(self, value: float):
+        self._state[1] = value
+
+    @property
+    def vx(self) -> float:
+        return self._state[2]
+
+    @vx.setter
+    def vx(self, value: float):
+        self._state[2] = value
+
+    @property
+    def vy(self) -> float:
+        return self._state[3]
+
+    @vy.setter
+    def vy(self, value: float):
+        self._state[3] = value
+
+    def _attach_state(self, row: np.ndarray):
+        """Point this body at its row of the simulation state array"""
+        self._state = row
+
     def add_to_trail(self, subdivisions: int = 1):
         """Add multiple points to trail for smoother curves"""
-        if len(self.trail) > 0:
-            last_x, last_y = self.trail[-1]
-            for i in range(1, subdivisions + 1):
-                t = i / subdivisions
-                interp_x = last_x + (self.x - last_x) * t
-                interp_y = last_y + (self.y - last_y) * t
-                self.trail.append((interp_x, interp_y))
-        else:
-            self.trail.append((self.x, self.y))
-        
-        # Maintain trail length
-        while len(self.trail) > self.max_trail_length:
-            self.trail.pop(0)
+        # Scenarios may adjust max_trail_length after construction
+        if self._trail_buf.shape[0] != self.max_trail_length:
+            old = self.get_trail()[-self.max_trail_length:]
+            self._trail_buf = np.empty((self.max_trail_length, 2), dtype=np.float32)
+            self._trail_buf[:len(old)] = old
+            self._trail_head = len(old) % self.max_trail_length
+            self._trail_count = len(old)
+
+        if self._trail_count == 0 or subdivisions == 1:
+            self._push_trail_point(self.x, self.y)
+            return
+
+        buf = self._trail_buf
+        length = self.max_trail_length
+        head = self._trail_head
+        last = buf[(head - 1) % length]
+
+        # All interpolated points in one ufunc pass; they lie on the
+        # segment from the last stored point to the current position
+        ts = np.linspace(1.0 / subdivisions, 1.0, subdivisions,
+                         dtype=np.float32)[:, None]
+        delta = np.array((self.x - last[0], self.y - last[1]),
+                         dtype=np.float32)
+        new_points = last + ts * delta
+
+        n = subdivisions
+        if n >= length:
+            new_points = new_points[-length:]
+            n = length
+
+        # Bulk write into the ring: at most two contiguous slice copies
+        first = min(n, length - head)
+        buf[head:head + first] = new_points[:first]
+        if n > first:
+            buf[:n - first] = new_points[first:]
+        self._trail_head = (head + n) % length
+        self._trail_count = min(self._trail_count + n, length)
+
+        # The segment endpoints bound every interpolated point, and the
+        # last stored point is already inside the box
+        self._trail_min_x = min(self._trail_min_x, self.x)
+        self._trail_min_y = min(self._trail_min_y, self.y)
+        self._trail_max_x = max(self._trail_max_x, self.x)
+        self._trail_max_y = max(self._trail_max_y, self.y)
+
+    def _push_trail_point(self, x: float, y: float):
+        """O(1) ring-buffer append, overwriting the oldest point when full"""
+        self._trail_buf[self._trail_head] = (x, y)
+        self._trail_head = (self._trail_head + 1) % self.max_trail_length
+        self._trail_count = min(self._trail_count + 1, self.max_trail_length)
+        self._trail_min_x = min(self._trail_min_x, x)
+        self._trail_min_y = min(self._trail_min_y, y)
+        self._trail_max_x = max(self._trail_max_x, x)
+        self._trail_max_y = max(self._trail_max_y, y)
+
+    def get_trail(self) -> np.ndarray:
+        """Return trail points oldest-first as an (N, 2) float32 array"""
+        if self._trail_count < self.max_trail_length:
+            return self._trail_buf[:self._trail_count]
+        # Unwrap the full ring into a reusable scratch buffer so the
+        # per-frame call doesn't allocate
+        if self._trail_scratch.shape[0] != self.max_trail_length:
+            self._trail_scratch = np.empty(
+                (self.max_trail_length, 2), dtype=np.float32)
+        head = self._trail_head
+        tail_len = self.max_trail_length - head
+        self._trail_scratch[:tail_len] = self._trail_buf[head:]
+        self._trail_scratch[tail_len:] = self._trail_buf[:head]
+        return self._trail_scratch
+
+    @property
+    def trail_length(self) -> int:
+        return self._trail_count
+
+    @property
+    def trail_aabb(self) -> Tuple[float, float, float, float]:
+        """World-space (min_x, min_y, max_x, max_y) of the trail"""
+        return (self._trail_min_x, self._trail_min_y,
+                self._trail_max_x, self._trail_max_y)
+
+    def clear_trail(self):
+        self._trail_head = 0
+        self._trail_count = 0
+        self._trail_min_x = math.inf
+        self._trail_min_y = math.inf
+        self._trail_max_x = -math.inf
+        self._trail_max_y = -math.inf
     
     def emit_particles(self, dt: float):
-        """Emit trail particles"""
+        """Emit trail particles into the simulation's shared pool"""
         self.particle_timer += dt
-        
+
         if self.particle_timer >= 1.0 / self.particle_emission_rate:
             # Emit particle based on velocity
-            speed = math.sqrt(self.vx**2 + self.vy**2)
-            if speed > 0.1:  # Only emit when moving
-                particle_life = random.uniform(2.0, 4.0)
-                particle = Particle(
+            speed = math.hypot(self.vx, self.vy)
+            if speed > 0.1 and self._particle_pool is not None:
+                self._particle_pool.emit(
                     self.x + random.uniform(-0.1, 0.1),
                     self.y + random.uniform(-0.1, 0.1),
-                    particle_life,
+                    random.uniform(2.0, 4.0),
                     self.color
                 )
-                self.particles.append(particle)
             self.particle_timer = 0.0
-        
-        # Update and remove dead particles
-        self.particles = [p for p in self.particles if p.life > 0]
-        for particle in self.particles:
-            particle.update(dt)
-    
-    def update_visual_effects(self, dt: float):
-        """Update visual effects like pulsation"""
-        self.pulsation_phase += dt * 3.0
-        pulse_factor = 1.0 + 0.1 * math.sin(self.pulsation_phase)
-        self.radius = self.base_radius * pulse_factor
-        
-        # Update collision effects
-        if self.collision_detected:
-            self.collision_timer += dt
-            if self.collision_timer > 1.0:
-                self.collision_detected = False
-                self.collision_timer = 0.0
     
     def get_position(self) -> np.ndarray:
-        return np.array([self.x, self.y])
-    
+        # View into the state row, not a copy - callers that need to
+        # keep the value past the next step must copy explicitly
+        return self._state[:2]
+
     def get_velocity(self) -> np.ndarray:
-        return np.array([self.vx, self.vy])
+        return self._state[2:]
     
     def set_state(self, x: float, y: float, vx: float, vy: float):
-        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+        self._state[:] = (x, y, vx, vy)
     
     def get_kinetic_energy(self) -> float:
-        return 0.5 * self.mass * (self.vx**2 + self.vy**2)
-    
+        return 0.5 * self.mass * (self.vx * self.vx + self.vy * self.vy)
+
     def get_speed(self) -> float:
-        return math.sqrt(self.vx**2 + self.vy**2)
+        return math.hypot(self.vx, self.vy)
 
 class AdvancedThreeBodySimulation:
     """High-performance three-body simulation with multiple integration methods"""
@@ -154,6 +605,10 @@ class AdvancedThreeBodySimulation:
     def __init__(self, settings: PhysicsSettings = None):
         self.settings = settings or PhysicsSettings()
         self.G = 1.0  # Gravitational constant
+
+        # Derived constants hoisted out of the pairwise inner loops
+        self._eps2 = float(self.settings.softening_parameter) ** 2
+        self._collision_r2 = float(self.settings.collision_threshold) ** 2
         self.bodies: List[Body] = []
         self.time = 0.0
         self.frame_count = 0
@@ -175,14 +630,40 @@ class AdvancedThreeBodySimulation:
         
         # Collision system
         self.collision_events = []
+
+        # Shared particle pool; bodies emit into it, updates run as
+        # whole-array operations
+        self.particles = ParticlePool()
         
         # Center of mass tracking
         self.center_of_mass = np.array([0.0, 0.0])
         self.center_of_mass_velocity = np.array([0.0, 0.0])
+
+        # Canonical SoA state: row i is [x, y, vx, vy] of body i. Bodies
+        # hold views into these rows, so integrators can work on the
+        # arrays without any per-body pack/unpack.
+        self._state = np.zeros((0, 4))
+        self._mass = np.zeros(0)
+        # Last accelerations reported by the integrators, (N, 2)
+        self._acc = np.zeros((0, 2))
+
+        # Pulsation state for all bodies, updated in one ufunc pass
+        self._pulse_phase = np.zeros(0)
+        self._base_radius = np.zeros(0)
     
     def add_body(self, body: Body):
         """Add a body to the simulation"""
         self.bodies.append(body)
+        body._particle_pool = self.particles
+        self._state = np.vstack((self._state, body._state[None, :]))
+        self._mass = np.array([b.mass for b in self.bodies])
+        self._pulse_phase = np.array([b.pulsation_phase for b in self.bodies])
+        self._base_radius = np.array([b.base_radius for b in self.bodies])
+
+        # vstack reallocates, so re-point every body at its new row
+        for i, b in enumerate(self.bodies):
+            b._attach_state(self._state[i])
+
         self.update_center_of_mass()
     
     def update_center_of_mass(self):
@@ -190,167 +671,114 @@ class AdvancedThreeBodySimulation:
         if not self.bodies:
             return
         
-        total_mass = sum(body.mass for body in self.bodies)
-        com_x = sum(body.mass * body.x for body in self.bodies) / total_mass
-        com_y = sum(body.mass * body.y for body in self.bodies) / total_mass
-        self.center_of_mass = np.array([com_x, com_y])
-        
-        com_vx = sum(body.mass * body.vx for body in self.bodies) / total_mass
-        com_vy = sum(body.mass * body.vy for body in self.bodies) / total_mass
-        self.center_of_mass_velocity = np.array([com_vx, com_vy])
+        # One weighted sum over the SoA state instead of four Python
+        # generator passes over the body list
+        m = self._mass
+        total_mass = m.sum()
+        self.center_of_mass = (m[:, None] * self._state[:, :2]).sum(0) / total_mass
+        self.center_of_mass_velocity = (m[:, None] * self._state[:, 2:]).sum(0) / total_mass
     
     def calculate_gravitational_force(self, body1: Body, body2: Body) -> Tuple[float, float]:
         """Calculate gravitational force with softening parameter"""
         dx = body2.x - body1.x
         dy = body2.y - body1.y
-        
+
         # Distance with softening
-        r_squared = dx**2 + dy**2 + self.settings.softening_parameter**2
-        r = math.sqrt(r_squared)
-        
-        # Check for collision
-        actual_distance = math.sqrt(dx**2 + dy**2)
-        if actual_distance < self.settings.collision_threshold:
+        r_squared = dx * dx + dy * dy + self._eps2
+
+        # Check for collision against the squared threshold - no sqrt
+        if r_squared < self._collision_r2 + self._eps2:
             body1.collision_detected = True
             body2.collision_detected = True
             self.collision_events.append((self.time, body1.name, body2.name))
-        
-        # Gravitational force magnitude
-        F_magnitude = self.G * body1.mass * body2.mass / r_squared
-        
-        # Force components
-        Fx = F_magnitude * dx / r
-        Fy = F_magnitude * dy / r
-        
-        return Fx, Fy
-    
-    def get_derivatives_rk4(self, state: np.ndarray) -> np.ndarray:
-        """Calculate derivatives for RK4 integration"""
-        derivatives = np.zeros_like(state)
-        
-        # Extract positions and velocities
-        positions = []
-        velocities = []
-        masses = []
-        
-        for i in range(len(self.bodies)):
-            idx = i * 4
-            positions.append([state[idx], state[idx + 1]])
-            velocities.append([state[idx + 2], state[idx + 3]])
-            masses.append(self.bodies[i].mass)
-        
-        # Set velocity derivatives (dx/dt = vx, dy/dt = vy)
-        for i in range(len(self.bodies)):
-            idx = i * 4
-            derivatives[idx] = state[idx + 2]      # dx/dt = vx
-            derivatives[idx + 1] = state[idx + 3]  # dy/dt = vy
-        
-        # Calculate acceleration derivatives
-        for i in range(len(self.bodies)):
-            ax, ay = 0.0, 0.0
-            
-            for j in range(len(self.bodies)):
-                if i != j:
-                    dx = positions[j][0] - positions[i][0]
-                    dy = positions[j][1] - positions[i][1]
-                    
-                    r_squared = dx**2 + dy**2 + self.settings.softening_parameter**2
-                    r = math.sqrt(r_squared)
-                    
-                    # Acceleration due to body j
-                    a_magnitude = self.G * masses[j] / r_squared
-                    ax += a_magnitude * dx / r
-                    ay += a_magnitude * dy / r
-            
-            # Store forces for visualization
-            self.bodies[i].force_x = ax * self.bodies[i].mass
-            self.bodies[i].force_y = ay * self.bodies[i].mass
-            self.bodies[i].acceleration_x = ax
-            self.bodies[i].acceleration_y = ay
-            
-            # Set acceleration derivatives
-            idx = i * 4
-            derivatives[idx + 2] = ax
-            derivatives[idx + 3] = ay
-        
-        return derivatives
+
+        # Force components via 1/r^3 - same idiom as the compiled
+        # kernels: one sqrt and no divisions beyond the reciprocal
+        r1i = 1.0 / math.sqrt(r_squared)
+        r3i = r1i * r1i * r1i
+        s = self.G * body1.mass * body2.mass * r3i
+        return s * dx, s * dy
     
     def rk4_step(self, dt: float):
         """4th order Runge-Kutta integration step"""
         if len(self.bodies) < 2:
             return
-        
-        # Convert state to array
-        state = np.zeros(len(self.bodies) * 4)
-        for i, body in enumerate(self.bodies):
-            idx = i * 4
-            state[idx:idx+4] = [body.x, body.y, body.vx, body.vy]
-        
-        # RK4 integration
-        k1 = self.get_derivatives_rk4(state)
-        k2 = self.get_derivatives_rk4(state + 0.5 * dt * k1)
-        k3 = self.get_derivatives_rk4(state + 0.5 * dt * k2)
-        k4 = self.get_derivatives_rk4(state + dt * k3)
-        
-        new_state = state + (dt / 6.0) * (k1 + 2*k2 + 2*k3 + k4)
-        
-        # Apply new state
+
+        # All four substages run inside one fused kernel call; the
+        # in-place update is immediately visible through every body's
+        # row view. The canonical three-body case gets the unrolled
+        # scalar kernel.
+        if len(self.bodies) == 3:
+            m = self._mass
+            acc = _rk4_step_n3(self._state, m[0], m[1], m[2],
+                               self._eps2, self.G, dt)
+        else:
+            acc = _rk4_step(self._state, self._mass, self._eps2, self.G, dt)
+        self._acc = acc
+
+        # Store the stage-1 forces for visualization
         for i, body in enumerate(self.bodies):
-            idx = i * 4
-            body.set_state(new_state[idx], new_state[idx+1], 
-                          new_state[idx+2], new_state[idx+3])
+            body.acceleration_x = acc[i, 0]
+            body.acceleration_y = acc[i, 1]
+            body.force_x = acc[i, 0] * body.mass
+            body.force_y = acc[i, 1] * body.mass
     
     def leapfrog_step(self, dt: float):
         """Leapfrog integration (symplectic, good for energy conservation)"""
         if len(self.bodies) < 2:
             return
-        
-        # Half velocity step
-        for body in self.bodies:
-            ax, ay = self.calculate_acceleration(body)
-            body.vx += 0.5 * dt * ax
-            body.vy += 0.5 * dt * ay
-        
-        # Full position step
-        for body in self.bodies:
-            body.x += dt * body.vx
-            body.y += dt * body.vy
-        
-        # Half velocity step
-        for body in self.bodies:
-            ax, ay = self.calculate_acceleration(body)
-            body.vx += 0.5 * dt * ax
-            body.vy += 0.5 * dt * ay
-    
+
+        # Views into the SoA state; updates land in place
+        pos = self._state[:, :2]
+        vel = self._state[:, 2:]
+        eps2 = self._eps2
+
+        # Half kick, drift, half kick - each kick is one kernel call for
+        # all bodies instead of a per-body acceleration pass
+        vel += 0.5 * dt * _compute_accelerations(
+            np.ascontiguousarray(pos), self._mass, eps2, self.G)
+        pos += dt * vel
+        vel += 0.5 * dt * _compute_accelerations(
+            np.ascontiguousarray(pos), self._mass, eps2, self.G)
+
     def calculate_acceleration(self, target_body: Body) -> Tuple[float, float]:
         """Calculate total acceleration on a body"""
-        ax, ay = 0.0, 0.0
-        
-        for body in self.bodies:
-            if body != target_body:
-                dx = body.x - target_body.x
-                dy = body.y - target_body.y
-                
-                r_squared = dx**2 + dy**2 + self.settings.softening_parameter**2
-                r = math.sqrt(r_squared)
-                
-                a_magnitude = self.G * body.mass / r_squared
-                ax += a_magnitude * dx / r
-                ay += a_magnitude * dy / r
-        
-        return ax, ay
+        pos = np.ascontiguousarray(self._state[:, :2])
+        acc = _compute_accelerations(pos, self._mass, self._eps2, self.G)
+        idx = self.bodies.index(target_body)
+        return acc[idx, 0], acc[idx, 1]
     
+    def update_visual_effects(self, dt: float):
+        """Update pulsation and collision flashes for all bodies at once"""
+        if not self.bodies:
+            return
+
+        # One sin ufunc over the phase array instead of a math.sin call
+        # per body; only the radius writeback stays per-body
+        self._pulse_phase += dt * 3.0
+        radii = self._base_radius * (1.0 + 0.1 * np.sin(self._pulse_phase))
+        for body, radius in zip(self.bodies, radii.tolist()):
+            body.radius = radius
+
+        # Collision flash timers
+        for body in self.bodies:
+            if body.collision_detected:
+                body.collision_timer += dt
+                if body.collision_timer > 1.0:
+                    body.collision_detected = False
+                    body.collision_timer = 0.0
+
     def adaptive_timestep_control(self):
         """Adjust timestep based on system dynamics"""
         if not self.settings.adaptive_timestep:
             return
         
-        # Calculate maximum acceleration
-        max_acceleration = 0.0
-        for body in self.bodies:
-            acc_mag = math.sqrt(body.acceleration_x**2 + body.acceleration_y**2)
-            max_acceleration = max(max_acceleration, acc_mag)
-        
+        if self._acc.shape[0] == 0:
+            return
+
+        # Maximum acceleration as one vectorized reduction
+        max_acceleration = np.hypot(self._acc[:, 0], self._acc[:, 1]).max()
+
         # Adjust timestep based on acceleration
         if max_acceleration > 0:
             optimal_dt = math.sqrt(self.error_tolerance / max_acceleration)
@@ -363,34 +791,27 @@ class AdvancedThreeBodySimulation:
         if len(self.bodies) < 2:
             return
         
-        # Total energy
-        kinetic_energy = sum(body.get_kinetic_energy() for body in self.bodies)
-        potential_energy = 0.0
-        
-        for i in range(len(self.bodies)):
-            for j in range(i + 1, len(self.bodies)):
-                dx = self.bodies[j].x - self.bodies[i].x
-                dy = self.bodies[j].y - self.bodies[i].y
-                r = math.sqrt(dx**2 + dy**2)
-                
-                if r > self.settings.softening_parameter:
-                    potential_energy -= (self.G * self.bodies[i].mass * 
-                                       self.bodies[j].mass / r)
-        
+        pos = self._state[:, :2]
+        vel = self._state[:, 2:]
+        mass = self._mass
+
+        # Total energy - potential from the unique pairs (upper triangle
+        # of the pairwise distance matrix), no Python-level pair loop
+        kinetic_energy = 0.5 * np.sum(mass * np.sum(vel * vel, axis=1))
+
+        iu, ju = np.triu_indices(len(self.bodies), k=1)
+        diff = pos[ju] - pos[iu]
+        r = np.sqrt(np.sum(diff * diff, axis=1))
+        contributing = r > self.settings.softening_parameter
+        potential_energy = -self.G * np.sum(
+            mass[iu[contributing]] * mass[ju[contributing]] / r[contributing])
+
         total_energy = kinetic_energy + potential_energy
-        
-        # Total momentum
-        total_momentum = np.array([0.0, 0.0])
-        for body in self.bodies:
-            total_momentum[0] += body.mass * body.vx
-            total_momentum[1] += body.mass * body.vy
-        
-        # Total angular momentum
-        total_angular_momentum = 0.0
-        for body in self.bodies:
-            # L = r × p = r × mv
-            total_angular_momentum += (body.x * body.mass * body.vy - 
-                                     body.y * body.mass * body.vx)
+
+        # Total momentum and angular momentum (L = r x mv) as dot products
+        total_momentum = mass @ vel
+        total_angular_momentum = np.sum(
+            mass * (pos[:, 0] * vel[:, 1] - pos[:, 1] * vel[:, 0]))
         
         # Store history
         self.energy_history.append(total_energy)
@@ -409,28 +830,42 @@ class AdvancedThreeBodySimulation:
         if self.paused:
             return
         
-        # Choose integration method
-        if self.settings.integration_method == "RK4":
-            self.rk4_step(self.current_dt)
-        elif self.settings.integration_method == "Leapfrog":
-            self.leapfrog_step(self.current_dt)
+        # Integration and center of mass run fused in one compiled call;
+        # everything after this is non-JIT bookkeeping
+        if len(self.bodies) >= 2:
+            method = 0 if self.settings.integration_method == "Leapfrog" else 1
+            acc, com_x, com_y, com_vx, com_vy = _advance(
+                self._state, self._mass, self._eps2, self.G,
+                self.current_dt, method)
+            self.center_of_mass = np.array([com_x, com_y])
+            self.center_of_mass_velocity = np.array([com_vx, com_vy])
+
+            if method == 1:
+                # RK4 reports stage-1 accelerations; store them for the
+                # force display and the adaptive timestep, as rk4_step does
+                self._acc = acc
+                for i, body in enumerate(self.bodies):
+                    body.acceleration_x = acc[i, 0]
+                    body.acceleration_y = acc[i, 1]
+                    body.force_x = acc[i, 0] * body.mass
+                    body.force_y = acc[i, 1] * body.mass
         else:
-            self.rk4_step(self.current_dt)  # Default fallback
-        
+            self.update_center_of_mass()
+
         # Update visual effects and particles
         for body in self.bodies:
             body.add_to_trail(body.trail_quality)
             body.emit_particles(self.current_dt)
-            body.update_visual_effects(self.current_dt)
-            
+
             # Update speed history
             speed = body.get_speed()
             body.speed_history.append(speed)
             if len(body.speed_history) > 100:
                 body.speed_history.pop(0)
-        
-        # Update system properties
-        self.update_center_of_mass()
+
+        self.particles.update(self.current_dt)
+        self.update_visual_effects(self.current_dt)
+
         self.adaptive_timestep_control()
         
         # Track conserved quantities
@@ -439,7 +874,72 @@ class AdvancedThreeBodySimulation:
         
         self.time += self.current_dt
         self.frame_count += 1
-    
+
+    def step_batch(self, n_steps: int):
+        """Advance several steps in one compiled kernel call
+
+        Runs the integration loop inside step_many so high simulation
+        speeds pay for one Python dispatch per frame instead of one per
+        step. Per-step bookkeeping (trails, particles, conservation
+        tracking) runs once per batch.
+        """
+        if self.paused or n_steps <= 0:
+            return
+
+        if len(self.bodies) < 2:
+            for _ in range(n_steps):
+                self.step()
+            return
+
+        method = 0 if self.settings.integration_method == "Leapfrog" else 1
+        acc = step_many(self._state, self._mass, self.current_dt, n_steps,
+                        self._eps2, self.G, method)
+        self._acc = acc
+
+        for i, body in enumerate(self.bodies):
+            body.acceleration_x = acc[i, 0]
+            body.acceleration_y = acc[i, 1]
+            body.force_x = acc[i, 0] * body.mass
+            body.force_y = acc[i, 1] * body.mass
+
+        self.check_collisions()
+
+        # Visual effects and tracking, once per batch
+        elapsed = self.current_dt * n_steps
+        for body in self.bodies:
+            body.add_to_trail(body.trail_quality)
+            body.emit_particles(elapsed)
+
+            speed = body.get_speed()
+            body.speed_history.append(speed)
+            if len(body.speed_history) > 100:
+                body.speed_history.pop(0)
+
+        self.particles.update(elapsed)
+        self.update_visual_effects(elapsed)
+
+        self.update_center_of_mass()
+        self.adaptive_timestep_control()
+
+        # Track conserved quantities on the same cadence as step()
+        if (self.frame_count // 10) != ((self.frame_count + n_steps) // 10):
+            self.calculate_conserved_quantities()
+
+        self.time += elapsed
+        self.frame_count += n_steps
+
+    def check_collisions(self):
+        """Flag bodies closer than the collision threshold"""
+        for i in range(len(self.bodies)):
+            for j in range(i + 1, len(self.bodies)):
+                body1, body2 = self.bodies[i], self.bodies[j]
+                dx = body2.x - body1.x
+                dy = body2.y - body1.y
+                if dx * dx + dy * dy < self._collision_r2:
+                    body1.collision_detected = True
+                    body2.collision_detected = True
+                    self.collision_events.append((self.time, body1.name, body2.name))
+
     def reset(self):
         """Reset simulation state"""
         self.time = 0.0
@@ -450,9 +950,9 @@ class AdvancedThreeBodySimulation:
         self.angular_momentum_history = []
         self.collision_events = []
         
+        self.particles.clear()
         for body in self.bodies:
-            body.trail = []
-            body.particles = []
+            body.clear_trail()
             body.speed_history = []
             body.collision_detected = False
     